@@ -0,0 +1,82 @@
+# Reading the tail of a long chapter for prompt context, and saving a one
+# paragraph edit to it, through the paragraph chunk store against the whole
+# Chapter.text.
+#
+#   python benchmarks/bench_chapter_chunks.py [--paragraphs 2500] [--words-per-paragraph 60]
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'chunks.db')}"
+
+from sqlalchemy import event, select
+
+from main import app, db, User, Story, Chapter, ChapterChunk, chapter_tail, tail_within_budget, RECENT_CONTEXT_TOKENS
+
+WORDS = ['the', 'rain', 'fell', 'on', 'old', 'harbour', 'where', 'she', 'waited', 'for', 'ships', 'again']
+
+
+def paragraph(rng, words):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize() + '.'
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        db.session.expire_all()
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--paragraphs', type=int, default=2500)
+    parser.add_argument('--words-per-paragraph', type=int, default=60)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    with app.app_context():
+        db.create_all()
+        paragraphs = [paragraph(rng, args.words_per_paragraph) for _ in range(args.paragraphs)]
+        user = User(username='chunks', password_hash='x')
+        story = Story(user=user, title='Long')
+        chapter = Chapter(story=story, title='Chapter 1', text='\n\n'.join(paragraphs), summary='')
+        db.session.add_all([user, story, chapter])
+        db.session.commit()
+        chapter_id = chapter.id
+        print(f"chapter: {args.paragraphs * args.words_per_paragraph:,} words, {ChapterChunk.query.filter_by(chapter_id=chapter_id).count()} chunks")
+
+        budget = RECENT_CONTEXT_TOKENS
+        whole = timed(lambda: tail_within_budget(db.session.scalar(select(Chapter.text).where(Chapter.id == chapter_id)), budget), args.repeat)
+        chunked = timed(lambda: tail_within_budget(chapter_tail(chapter_id, budget), budget), args.repeat)
+        print(f"recent context ({budget} tokens): whole text {whole:7.2f} ms   chunks {chunked:7.2f} ms")
+
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            if 'chapter_chunk' in statement and not statement.startswith('SELECT'):
+                statements.append(statement.split()[0])
+
+        def edit():
+            index = rng.randrange(len(paragraphs))
+            paragraphs[index] = paragraph(rng, args.words_per_paragraph)
+            db.session.get(Chapter, chapter_id).text = '\n\n'.join(paragraphs)
+            db.session.commit()
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        save = timed(edit, args.repeat)
+        event.remove(db.engine, 'before_cursor_execute', record)
+        print(f"one-paragraph save: {save:7.2f} ms, {len(statements) / args.repeat:.1f} chunk writes per save ({', '.join(sorted(set(statements)))})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# Latency, query count and peak Python memory for the chapter
+# list and story dashboard of a short story against a long novel. With chapter
+# text deferred the two should cost about the same.
+#
+#   python benchmarks/bench_chapter_list.py [--chapters 3 150] [--words-per-chapter 6000]
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'chapter_list.db')}"
+
+from sqlalchemy import event
+
+from main import app, db, User, Story, Chapter
+
+
+def seed(user, chapters, words_per_chapter):
+    story = Story(user=user, title=f'{chapters} chapters')
+    db.session.add(story)
+    text = ' '.join(['word'] * words_per_chapter)
+    db.session.add_all([Chapter(story=story, title=f'Chapter {n + 1}', text=text, summary=text[:2000]) for n in range(chapters)])
+    db.session.commit()
+    return story.id
+
+
+def measure(engine, client, url, repeat):
+    fetched = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        fetched.append(cursor)
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        response = client.get(url)
+        timings.append((time.perf_counter() - started) * 1000)
+        if response.status_code != 200:
+            raise SystemExit(f"GET {url} returned {response.status_code}")
+    tracemalloc.start()
+    event.listen(engine, 'after_cursor_execute', record)
+    try:
+        client.get(url)
+    finally:
+        event.remove(engine, 'after_cursor_execute', record)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak, len(fetched)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chapters', type=int, nargs='+', default=[3, 150])
+    parser.add_argument('--words-per-chapter', type=int, default=6000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        user = User(username='lister', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        stories = {chapters: seed(user, chapters, args.words_per_chapter) for chapters in args.chapters}
+        user_id = user.id
+        engine = db.engine
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+    for label, path in (('chapters', '/story/{}/chapters'), ('dashboard', '/story/{}')):
+        for chapters, story_id in stories.items():
+            p50, peak, queries = measure(engine, client, path.format(story_id), args.repeat)
+            print(f"{label:<10} {chapters:>4} chapters: p50 {p50:7.2f} ms  peak {peak / 1024:8.1f} KiB  {queries} queries")
+
+
+if __name__ == '__main__':
+    main()
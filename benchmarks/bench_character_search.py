@@ -0,0 +1,70 @@
+# Latency of the character autocomplete search for a story with thousands of
+# characters, over a mix of prefix, substring, typo and traits queries.
+#
+#   python benchmarks/bench_character_search.py [--characters 5000] [--repeat 50]
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'search.db')}"
+
+import main
+from main import app, db, User, Story, Character, create_search_indexes, search_characters
+
+SYLLABLES = ['an', 'na', 'ma', 'ya', 'el', 'li', 'ro', 'sa', 'ka', 'th', 'or', 'in', 'be', 'to']
+QUERIES = ['Ma', 'May', 'mayak', 'Mayka', 'elin', 'rosa', 'Thorin Oakenshield', 'Thorn Okenshield', 'loyal', 'zzzq']
+
+
+def seed(count, rng):
+    user = User(username='search', password_hash='x')
+    story = Story(user=user, title='Search')
+    db.session.add_all([user, story])
+    db.session.flush()
+    db.session.add_all([
+        Character(
+            story_id=story.id,
+            name=''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+            + ' ' + ''.join(rng.choice(SYLLABLES) for _ in range(3)).capitalize(),
+            traits=rng.choice(['loyal', 'brave', 'cunning', 'quiet']) + ' ' + rng.choice(SYLLABLES),
+            backstory='Born in ' + ''.join(rng.choice(SYLLABLES) for _ in range(3)).capitalize(),
+        )
+        for _ in range(count)
+    ])
+    db.session.add(Character(story_id=story.id, name='Thorin Oakenshield', aliases='Oakenshield', traits='proud'))
+    db.session.commit()
+    return story.id
+
+
+def main_():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--characters', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        create_search_indexes()
+        story_id = seed(args.characters, random.Random(11))
+        print(f"{args.characters} characters, FTS5 trigram index: {'yes' if main.fts_search_available else 'no (LIKE fallback)'}")
+        worst = 0.0
+        for query in QUERIES:
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results, _ = search_characters(story_id, query)
+                timings.append((time.perf_counter() - started) * 1000)
+            p95 = sorted(timings)[int(len(timings) * 0.95) - 1]
+            worst = max(worst, p95)
+            top = results[0]['name'] if results else '-'
+            print(f"  {query!r:<22} p50 {statistics.median(timings):6.2f} ms  p95 {p95:6.2f} ms  top: {top}")
+    print(f"worst p95: {worst:.2f} ms")
+
+
+if __name__ == '__main__':
+    main_()
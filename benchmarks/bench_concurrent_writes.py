@@ -0,0 +1,128 @@
+# Concurrent chapter saves against SQLite, once with the rollback journal and
+# once with WAL. Like gunicorn workers, every writer and reader is its own
+# process: writers keep saving their own chapter through the ORM (so revision
+# history and search triggers run as in the app) while readers load chapters.
+#
+#   python benchmarks/bench_concurrent_writes.py [--writers 8] [--readers 8] [--seconds 5]
+import argparse
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+
+JOURNAL_MODES = ('DELETE', 'WAL')
+
+
+def percentile(values, fraction):
+    return sorted(values)[int(fraction * (len(values) - 1))] if values else 0.0
+
+
+def words():
+    rng = random.Random(3)
+    return [''.join(rng.choice('etaoinshrdlu') for _ in range(rng.randint(3, 8))) for _ in range(2000)]
+
+
+def seed(writers):
+    from main import app, db, User, Story, Chapter, create_search_indexes
+    rng = random.Random(3)
+    vocabulary = words()
+    with app.app_context():
+        db.create_all()
+        create_search_indexes()
+        user = User(username='writer', password_hash='x')
+        db.session.add(user)
+        db.session.flush()
+        story = Story(user_id=user.id, title='Concurrent')
+        db.session.add(story)
+        db.session.flush()
+        db.session.add_all([Chapter(story_id=story.id, title=f'Chapter {n}', text=' '.join(rng.choices(vocabulary, k=5000))) for n in range(writers)])
+        db.session.commit()
+
+
+def work(role, number, writers, seconds):
+    # Reports ready once the app is imported, waits for the shared start time
+    # on stdin, then prints its latencies and errors as one JSON line.
+    from sqlalchemy.exc import OperationalError
+    from main import app, db, Chapter
+    rng = random.Random(number)
+    vocabulary = words()
+    chapter_ids = list(range(1, writers + 1))
+    latencies, errors = [], []
+    print('ready', flush=True)
+    start_at = float(sys.stdin.readline())
+    with app.app_context():
+        time.sleep(max(start_at - time.time(), 0))
+        deadline = start_at + seconds
+        while time.time() < deadline:
+            started = time.perf_counter()
+            try:
+                if role == 'writer':
+                    chapter = db.session.get(Chapter, chapter_ids[number % writers])
+                    chapter.text += ' ' + ' '.join(rng.choices(vocabulary, k=12))
+                    db.session.commit()
+                else:
+                    db.session.get(Chapter, rng.choice(chapter_ids)).text
+                    db.session.rollback()
+                latencies.append((time.perf_counter() - started) * 1000)
+            except OperationalError as e:
+                db.session.rollback()
+                errors.append(str(e.orig))
+            db.session.expunge_all()
+    print(json.dumps({'role': role, 'latencies': latencies, 'errors': errors}))
+
+
+def compare(mode, args):
+    env = dict(os.environ, SQLITE_JOURNAL_MODE=mode, DATABASE_URL=f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'writes.db')}")
+    subprocess.run([sys.executable, __file__, '--role', 'seed', '--writers', str(args.writers)], env=env, check=True)
+    workers = [
+        subprocess.Popen([sys.executable, __file__, '--role', role, '--number', str(number), '--writers', str(args.writers),
+                          '--seconds', str(args.seconds)], env=env, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        for role, count in (('writer', args.writers), ('reader', args.readers)) for number in range(count)
+    ]
+    for worker in workers:
+        worker.stdout.readline()
+    start_at = time.time() + 0.5
+    for worker in workers:
+        worker.stdin.write(f'{start_at}\n')
+        worker.stdin.flush()
+    results = {'writer': [], 'reader': []}
+    errors = []
+    for worker in workers:
+        output, _ = worker.communicate()
+        result = json.loads(output.strip().splitlines()[-1])
+        results[result['role']].extend(result['latencies'])
+        errors.extend(result['errors'])
+    saves, reads = results['writer'], results['reader']
+    print(f"{mode:<7} saves {len(saves) / args.seconds:7.1f}/s  p50 {statistics.median(saves or [0]):6.1f} ms  "
+          f"p95 {percentile(saves, 0.95):7.1f} ms  |  reads {len(reads) / args.seconds:7.1f}/s  "
+          f"p95 {percentile(reads, 0.95):6.1f} ms  |  errors {len(errors)}")
+    for message in sorted(set(errors))[:3]:
+        print(f"        {message}")
+
+
+def main_():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--writers', type=int, default=8)
+    parser.add_argument('--readers', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--role', choices=('seed', 'writer', 'reader'))
+    parser.add_argument('--number', type=int, default=0)
+    args = parser.parse_args()
+    if args.role == 'seed':
+        seed(args.writers)
+    elif args.role:
+        work(args.role, args.number, args.writers, args.seconds)
+    else:
+        for mode in JOURNAL_MODES:
+            compare(mode, args)
+
+
+if __name__ == '__main__':
+    main_()
@@ -0,0 +1,64 @@
+# Throughput and peak Python memory of the streamed whole-story export
+# (Markdown, JSON, EPUB) for a short story against a long novel. Peak memory
+# should stay about the same as the novel grows.
+#
+#   python benchmarks/bench_export.py [--chapters 3 200] [--paragraphs-per-chapter 80]
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'export.db')}"
+
+from main import app, db, User, Story, Chapter, BeatScene, EXPORT_FORMATS
+
+PARAGRAPH = ' '.join(['The rain fell on the old harbour where she waited for ships again.'] * 5)
+
+
+def seed(user, chapters, paragraphs):
+    story = Story(user=user, title=f'{chapters} chapters')
+    db.session.add(story)
+    text = '\n\n'.join([PARAGRAPH] * paragraphs)
+    for n in range(chapters):
+        chapter = Chapter(story=story, title=f'Chapter {n + 1}', text=text, summary='')
+        db.session.add(chapter)
+        db.session.add_all([BeatScene(chapter=chapter, description=f'Beat {b}', order=b) for b in range(5)])
+    db.session.commit()
+    return story.id
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chapters', type=int, nargs='+', default=[3, 200])
+    parser.add_argument('--paragraphs-per-chapter', type=int, default=80)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        user = User(username='exporter', password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        stories = {chapters: seed(user, chapters, args.paragraphs_per_chapter) for chapters in args.chapters}
+        user_id = user.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+    for fmt in EXPORT_FORMATS:
+        for chapters, story_id in stories.items():
+            tracemalloc.start()
+            started = time.perf_counter()
+            response = client.get(f'/story/{story_id}/export?format={fmt}', buffered=False)
+            size = sum(len(block) for block in response.response)
+            elapsed = time.perf_counter() - started
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"{fmt:<8} {chapters:>4} chapters: {size / 1024 / 1024:7.2f} MiB in {elapsed * 1000:8.1f} ms"
+                  f"  ({size / 1024 / 1024 / elapsed:6.1f} MiB/s)  peak {peak / 1024:8.1f} KiB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+# Times the per-page lookups by story_id/chapter_id with and without the model
+# indexes as a story grows to thousands of chapters.
+#
+#   python benchmarks/bench_indexes.py [--sizes 100,1000,5000] [--repeat 200]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+
+from sqlalchemy import create_engine, insert, select
+
+from main import db, User, Story, Chapter, Character, PlotBrainstorm, BeatScene, KeyEvent, WorldBuildingElement
+
+CATEGORIES = ['Settings', 'Cultures', 'Magic and Tech', 'History', 'Races']
+STORIES = 20
+PER_CHAPTER = 5
+
+
+def seed(engine, chapters_per_story):
+    with engine.begin() as conn:
+        conn.execute(insert(User), [{'id': 1, 'username': 'bench', 'password_hash': 'x'}])
+        conn.execute(insert(Story), [{'id': s, 'user_id': 1, 'title': f'Story {s}'} for s in range(1, STORIES + 1)])
+        chapters = []
+        for s in range(1, STORIES + 1):
+            for c in range(chapters_per_story):
+                chapters.append({'story_id': s, 'title': f'Chapter {c}', 'text': ''})
+        conn.execute(insert(Chapter), chapters)
+        conn.execute(insert(Character), [
+            {'story_id': s, 'name': f'Character {s}-{n}'} for s in range(1, STORIES + 1) for n in range(chapters_per_story // 10 + 1)
+        ])
+        conn.execute(insert(PlotBrainstorm), [{'story_id': s, 'notes': ''} for s in range(1, STORIES + 1) for _ in range(10)])
+        chapter_ids = range(1, len(chapters) + 1)
+        for model in (BeatScene, KeyEvent):
+            conn.execute(insert(model), [
+                {'chapter_id': cid, 'description': '', 'order': o} for cid in chapter_ids for o in range(PER_CHAPTER)
+            ])
+        conn.execute(insert(WorldBuildingElement), [
+            {'chapter_id': cid, 'category': CATEGORIES[o], 'description': ''} for cid in chapter_ids for o in range(PER_CHAPTER)
+        ])
+    return len(chapters)
+
+
+def page_queries(story_id, chapter_id):
+    return {
+        'stories by user': select(Story).where(Story.user_id == 1),
+        'chapters by story': select(Chapter.id, Chapter.title).where(Chapter.story_id == story_id),
+        'characters by story': select(Character).where(Character.story_id == story_id),
+        'brainstorms by story': select(PlotBrainstorm).where(PlotBrainstorm.story_id == story_id),
+        'beats by chapter': select(BeatScene).where(BeatScene.chapter_id == chapter_id).order_by(BeatScene.order),
+        'events by chapter': select(KeyEvent).where(KeyEvent.chapter_id == chapter_id).order_by(KeyEvent.order),
+        'world by chapter': select(WorldBuildingElement).where(
+            WorldBuildingElement.chapter_id == chapter_id, WorldBuildingElement.category == 'History'
+        ),
+    }
+
+
+def time_queries(engine, total_chapters, repeat):
+    timings = {}
+    with engine.connect() as conn:
+        for name, query in page_queries(STORIES // 2, total_chapters // 2).items():
+            conn.execute(query).fetchall()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                conn.execute(query).fetchall()
+            timings[name] = (time.perf_counter() - started) / repeat * 1e6
+    return timings
+
+
+def drop_indexes(engine):
+    with engine.begin() as conn:
+        for table in db.metadata.sorted_tables:
+            for index in table.indexes:
+                index.drop(conn, checkfirst=True)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', default='100,1000,5000', help='chapters per story')
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'chapters/story':>14}  {'query':<22}{'indexed us':>12}{'no index us':>13}{'speedup':>9}")
+    for size in (int(s) for s in args.sizes.split(',')):
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_engine(f"sqlite:///{os.path.join(tmp, 'bench.db')}")
+            db.metadata.create_all(engine)
+            total = seed(engine, size)
+            indexed = time_queries(engine, total, args.repeat)
+            drop_indexes(engine)
+            plain = time_queries(engine, total, args.repeat)
+            engine.dispose()
+        for name in indexed:
+            print(f"{size:>14}  {name:<22}{indexed[name]:>12.1f}{plain[name]:>13.1f}{plain[name] / indexed[name]:>8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
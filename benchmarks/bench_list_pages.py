@@ -0,0 +1,82 @@
+# Latency of the first, a middle and the last page of the characters and
+# beats/scenes lists of a very large story, walking the keyset cursors the
+# pages hand out. Deep pages should cost the same as the first.
+#
+#   python benchmarks/bench_list_pages.py [--characters 50000] [--chapters 500] [--beats-per-chapter 100]
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'list_pages.db')}"
+
+from main import app, db, User, Story, Chapter, Character, BeatScene
+
+
+def seed(characters, chapters, beats_per_chapter):
+    user = User(username='prolific', password_hash='x')
+    story = Story(user=user, title='Saga')
+    db.session.add_all([user, story])
+    db.session.flush()
+    db.session.execute(Character.__table__.insert(), [
+        {'story_id': story.id, 'name': f'Character {n}', 'traits': 'curious'} for n in range(characters)
+    ])
+    db.session.execute(Chapter.__table__.insert(), [
+        {'story_id': story.id, 'title': f'Chapter {n + 1}', 'text': '', 'summary': ''} for n in range(chapters)
+    ])
+    chapter_ids = db.session.scalars(db.select(Chapter.id).where(Chapter.story_id == story.id)).all()
+    db.session.execute(BeatScene.__table__.insert(), [
+        {'chapter_id': chapter_id, 'description': f'Beat {n}', 'order': n % 7} for chapter_id in chapter_ids for n in range(beats_per_chapter)
+    ])
+    db.session.commit()
+    return user.id, story.id
+
+
+def walk(client, url, key):
+    # Cursors for every page, following next_cursor from the first.
+    cursors, cursor = [None], None
+    while True:
+        page = client.get(url + '?format=json' + (f'&cursor={cursor}' if cursor else '')).get_json()
+        cursor = page['next_cursor']
+        if not cursor:
+            return cursors
+        cursors.append(cursor)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--characters', type=int, default=50000)
+    parser.add_argument('--chapters', type=int, default=500)
+    parser.add_argument('--beats-per-chapter', type=int, default=100)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with app.app_context():
+        db.create_all()
+        user_id, story_id = seed(args.characters, args.chapters, args.beats_per_chapter)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+    for label, url, key in (
+        ('characters', f'/story/{story_id}/characters', 'characters'),
+        ('beats', f'/story/{story_id}/beats', 'beats'),
+    ):
+        cursors = walk(client, url, key)
+        print(f"{label}: {len(cursors)} pages")
+        for name, cursor in (('first', None), ('middle', cursors[len(cursors) // 2]), ('last', cursors[-1])):
+            for fmt in ('html', 'json'):
+                query = ('?format=json' if fmt == 'json' else '?x=1') + (f'&cursor={cursor}' if cursor else '')
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    client.get(url + query)
+                    timings.append((time.perf_counter() - started) * 1000)
+                print(f"  {name:<6} page {fmt:<4} p50 {statistics.median(timings):7.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
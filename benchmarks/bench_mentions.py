@@ -0,0 +1,61 @@
+# Mention detection over a whole chapter: the story's MentionIndex (one pass)
+# against one \b-regex search per character name.
+#
+#   python benchmarks/bench_mentions.py [--characters 300] [--words 20000]
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+
+from main import Character, MentionIndex
+
+SYLLABLES = ['an', 'na', 'ma', 'ya', 'el', 'li', 'ro', 'sa', 'ka', 'th', 'or', 'in']
+FILLER = ['the', 'a', 'ran', 'to', 'and', 'said', 'over', 'night']
+
+
+def make_cast(size, rng):
+    names = set()
+    while len(names) < size:
+        names.add(''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize())
+    return [
+        Character(id=n, name=name, aliases=f"{name} the Elder" if n % 5 == 0 else '')
+        for n, name in enumerate(sorted(names), start=1)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--characters', type=int, default=300)
+    parser.add_argument('--words', type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    cast = make_cast(args.characters, rng)
+    names = [char.name for char in cast]
+    text = ' '.join(rng.choice(names) if rng.random() < 0.1 else rng.choice(FILLER) for _ in range(args.words))
+
+    started = time.perf_counter()
+    index = MentionIndex(cast)
+    build = time.perf_counter() - started
+    started = time.perf_counter()
+    mentions = index.find(text)
+    indexed = time.perf_counter() - started
+
+    started = time.perf_counter()
+    naive = [c.name for c in cast if re.search(r'\b' + re.escape(c.name) + r'\b', text, re.IGNORECASE)]
+    per_name = time.perf_counter() - started
+
+    assert index.mentioned_names(text) == naive
+    print(f"{args.characters} characters, {args.words} words, {len(mentions)} mentions")
+    print(f"  build index:         {build * 1000:.1f} ms (once per characters_revision)")
+    print(f"  MentionIndex.find:   {indexed * 1000:.1f} ms (positions for every mention)")
+    print(f"  per-name re.search:  {per_name * 1000:.1f} ms (presence only)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+# Passage retrieval over one long story: the first index build, a query against
+# an up-to-date index, and the incremental sync after one chapter is edited.
+#
+#   python benchmarks/bench_retrieval.py [--chapters 100] [--words-per-chapter 5000]
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+workdir = tempfile.mkdtemp()
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(workdir, 'retrieval.db')}"
+os.environ['EMBEDDING_DIR'] = os.path.join(workdir, 'embeddings')
+
+from main import app, db, User, Story, Chapter, KeyEvent, passage_index_for, related_passages
+
+LETTERS = 'etaoinshrdlucmfwypvbgk'
+
+
+def vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 9))))
+    return sorted(words)
+
+
+def paragraphs(rng, words, weights, count):
+    return '\n\n'.join(' '.join(rng.choices(words, cum_weights=weights, k=rng.randint(40, 160))) for _ in range(count))
+
+
+def seed(rng, chapters, words_per_chapter):
+    words = vocabulary(rng, 20000)
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(words))))
+    user = User(username='retrieval', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    story = Story(user_id=user.id, title='Long story')
+    db.session.add(story)
+    db.session.flush()
+    for c in range(chapters):
+        chapter = Chapter(story_id=story.id, title=f'Chapter {c}', text=paragraphs(rng, words, weights, words_per_chapter // 100))
+        db.session.add(chapter)
+        db.session.flush()
+        db.session.add_all([KeyEvent(chapter_id=chapter.id, description=' '.join(rng.choices(words, cum_weights=weights, k=15)), order=n) for n in range(5)])
+    db.session.commit()
+    return story.id, words, weights
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return (time.perf_counter() - started) * 1000, result
+
+
+def main_():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chapters', type=int, default=100)
+    parser.add_argument('--words-per-chapter', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(11)
+    with app.app_context():
+        db.create_all()
+        story_id, words, weights = seed(rng, args.chapters, args.words_per_chapter)
+        story = db.session.get(Story, story_id)
+        last = story.chapters[-1]
+        index = passage_index_for(story_id)
+
+        def query():
+            return related_passages(story, last, ' '.join(rng.choices(words, cum_weights=weights, k=60)), recent_chars=12000)
+
+        elapsed, _ = timed(query)
+        print(f"first build    {elapsed:8.1f} ms  {len(index.rows):,} passages over {args.chapters * args.words_per_chapter:,} words")
+        timings = [timed(query)[0] for _ in range(args.repeat)]
+        print(f"query          p50 {statistics.median(timings):6.2f} ms  max {max(timings):6.2f} ms")
+
+        timings = []
+        for _ in range(args.repeat):
+            chapter = story.chapters[rng.randrange(len(story.chapters))]
+            cut = rng.randrange(len(chapter.text))
+            chapter.text = chapter.text[:cut] + ' ' + ' '.join(rng.choices(words, cum_weights=weights, k=30)) + chapter.text[cut:]
+            db.session.commit()
+            timings.append(timed(query)[0])
+        print(f"edit + query   p50 {statistics.median(timings):6.2f} ms  max {max(timings):6.2f} ms")
+        # Drop the in-memory state so the next query reloads the sidecar and memmap.
+        index.stamp = None
+        index.reset()
+        elapsed, _ = timed(query)
+        print(f"cold reload    {elapsed:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main_()
@@ -0,0 +1,84 @@
+# Full-text search latency over a library of about a million words, through
+# the same search_library() the /search page uses.
+#
+#   python benchmarks/bench_search.py [--chapters 200] [--words-per-chapter 5000]
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'search.db')}"
+
+import main
+from main import app, db, User, Story, Chapter, BeatScene, KeyEvent, create_search_indexes, search_library
+
+LETTERS = 'etaoinshrdlucmfwypvbgk'
+
+
+def vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 9))))
+    return sorted(words)
+
+
+def seed(rng, chapters, words_per_chapter):
+    words = vocabulary(rng, 20000)
+    # Zipf-ish: a few words are very common, most are rare.
+    weights = [1 / (rank + 1) for rank in range(len(words))]
+    user = User(username='search', password_hash='x')
+    db.session.add(user)
+    db.session.flush()
+    for s in range(max(chapters // 20, 1)):
+        story = Story(user_id=user.id, title=f'Story {s}')
+        db.session.add(story)
+        db.session.flush()
+        for c in range(20):
+            text = ' '.join(rng.choices(words, weights, k=words_per_chapter))
+            chapter = Chapter(story_id=story.id, title=f'Chapter {c}', text=text, summary=' '.join(rng.choices(words, weights, k=40)))
+            db.session.add(chapter)
+            db.session.flush()
+            db.session.add_all([BeatScene(chapter_id=chapter.id, description=' '.join(rng.choices(words, weights, k=20)), order=n) for n in range(5)])
+            db.session.add_all([KeyEvent(chapter_id=chapter.id, description=' '.join(rng.choices(words, weights, k=15)), order=n) for n in range(5)])
+        db.session.commit()
+    return user.id, words
+
+
+def main_():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--chapters', type=int, default=200)
+    parser.add_argument('--words-per-chapter', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    with app.app_context():
+        db.create_all()
+        create_search_indexes()
+        started = time.perf_counter()
+        user_id, words = seed(rng, args.chapters, args.words_per_chapter)
+        print(f"seeded {args.chapters * args.words_per_chapter:,} words in {time.perf_counter() - started:.1f}s "
+              f"(FTS5: {'yes' if main.prose_search_available else 'no, LIKE fallback'})")
+        queries = {
+            'common word': words[0],
+            'rare word': words[-1],
+            'two words': f"{words[3]} {words[500]}",
+            'prefix': words[1200][:3],
+            'no match': 'zzzzqqq',
+        }
+        for label, query in queries.items():
+            timings = []
+            for _ in range(args.repeat):
+                started = time.perf_counter()
+                results, _ = search_library(user_id, query)
+                timings.append((time.perf_counter() - started) * 1000)
+            print(f"  {label:<12} {query!r:<22} p50 {statistics.median(timings):7.2f} ms  max {max(timings):7.2f} ms  results {len(results)}")
+
+
+if __name__ == '__main__':
+    main_()
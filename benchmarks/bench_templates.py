@@ -0,0 +1,67 @@
+# Per-request render time of the chapter editor page: parsing the template
+# source on every call (the old render_template_string pattern) against the
+# loader-backed template compiled once at startup.
+#
+#   python benchmarks/bench_templates.py [--requests 500] [--items 20]
+import argparse
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+
+from flask import render_template, render_template_string
+
+from main import app, precompile_templates, AVAILABLE_MODELS, DEFAULT_PROSE_PRESET, DEFAULT_BEAT_PRESET, GENERATION_BUTTONS
+
+
+def editor_context(items):
+    chapter = SimpleNamespace(id=1, title='Chapter 1', summary='A summary.', text='Once upon a time. ' * 500)
+    return dict(
+        available_models=AVAILABLE_MODELS,
+        chapter=chapter,
+        story_id=1,
+        beats=[SimpleNamespace(id=n, description=f'Beat {n}', order=n) for n in range(items)],
+        key_events=[SimpleNamespace(id=n, description=f'Event {n}', order=n) for n in range(items)],
+        world_elements=[SimpleNamespace(id=n, category='History', description=f'Element {n}') for n in range(items)],
+        characters=[SimpleNamespace(id=n, name=f'Character {n}', traits='brave', backstory='') for n in range(items)],
+        detected_characters=[f'Character {n}' for n in range(items)],
+        prose_preset=DEFAULT_PROSE_PRESET,
+        ai_prose='',
+        ai_summary='',
+        beat_preset=DEFAULT_BEAT_PRESET,
+        ai_beat_scene='',
+        **{output: '' for _, _, output in GENERATION_BUTTONS.values()},
+    )
+
+
+def timed(render, requests):
+    started = time.perf_counter()
+    for _ in range(requests):
+        render()
+    return (time.perf_counter() - started) / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=500)
+    parser.add_argument('--items', type=int, default=20, help='characters, beats, events and world elements on the page')
+    args = parser.parse_args()
+
+    source, _, _ = app.jinja_loader.get_source(app.jinja_env, 'edit_chapter.html')
+    context = editor_context(args.items)
+    with app.test_request_context('/story/1/chapter/1'):
+        started = time.perf_counter()
+        precompile_templates()
+        print(f"precompile all templates: {(time.perf_counter() - started) * 1000:.1f} ms")
+        inline = timed(lambda: render_template_string(source, **context), args.requests)
+        loaded = timed(lambda: render_template('edit_chapter.html', **context), args.requests)
+    print(f"edit_chapter ({source.count(chr(10))} lines), {args.requests} renders:")
+    print(f"  render_template_string: {inline:.3f} ms/request")
+    print(f"  render_template:        {loaded:.3f} ms/request ({inline / loaded:.1f}x faster)")
+
+
+if __name__ == '__main__':
+    main()
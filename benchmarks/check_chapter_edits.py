@@ -0,0 +1,229 @@
+# Fails (exit status 1) if a chapter edit path loses or corrupts text:
+# apply_text_ops and text_splice against plain slicing; autosave splices
+# built by the editor's own splice() (run with node when it is installed),
+# including text with characters outside the BMP; the paragraph chunks and
+# mention counts kept in step with Chapter.text; and the revision history,
+# where every stored revision must rebuild to the text saved at it and the text
+# before each checkpoint save (a paste) must be kept. Chunks are kept small
+# here so long paragraphs are cut often.
+#
+#   python benchmarks/check_chapter_edits.py [--edits 100] [--rounds 2000] [--seed 7]
+import argparse
+import json
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'chapter_edits.db')}"
+os.environ.setdefault('CHUNK_MAX_CHARS', '48')
+
+from main import (
+    app, db, User, Story, Chapter, Character, ChapterChunk, ChapterRevision, CharacterMention,
+    apply_text_ops, text_splice, story_mention_index, rebuild_revision_text,
+)
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'templates', 'edit_chapter.html')
+ALPHABET = ['a', 'b', ' ', '\n', '\n\n', 'é', '😀', '𝔐', '中']
+WORDS = ['Mary', 'Jane', 'Mary Jane', 'Bob', 'the', 'harbour', 'waited', 'and', '😀']
+
+
+def python_splice(before, after):
+    start = 0
+    while start < len(before) and start < len(after) and before[start] == after[start]:
+        start += 1
+    end_before, end_after = len(before), len(after)
+    while end_before > start and end_after > start and before[end_before - 1] == after[end_after - 1]:
+        end_before -= 1
+        end_after -= 1
+    return {'start': start, 'end': end_before, 'text': after[start:end_after]}
+
+
+def editor_splice():
+    # The editor's splice() and base_length, evaluated by node, so this checks
+    # the code the browser runs.
+    node = shutil.which('node')
+    if not node:
+        print('node not found; using a Python copy of the editor splice')
+        return lambda before, after: (python_splice(before, after), len(before))
+    with open(TEMPLATE) as f:
+        source = re.search(r'function splice\(before, after\) \{.*?\n        \}', f.read(), re.S).group(0)
+    script = source + '''
+var input = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+process.stdout.write(JSON.stringify([splice(input[0], input[1]), Array.from(input[0]).length]));
+'''
+
+    def splice(before, after):
+        result = subprocess.run([node, '-e', script], input=json.dumps([before, after]), capture_output=True, text=True, check=True)
+        return tuple(json.loads(result.stdout))
+    return splice
+
+
+def random_text(rng, length):
+    return ''.join(rng.choice(ALPHABET) for _ in range(length))
+
+
+def random_edit(rng, text):
+    start = rng.randint(0, len(text))
+    end = min(len(text), start + rng.choice([0, 0, 1, 3, 20]))
+    return text[:start] + random_text(rng, rng.choice([0, 1, 2, 8])) + text[end:]
+
+
+def random_words(rng, count):
+    return ' '.join(rng.choice(WORDS) for _ in range(count))
+
+
+def check_chunks(story_id, chapter_id, rng, edits, failures):
+    for n in range(edits):
+        chapter = db.session.get(Chapter, chapter_id)
+        text = chapter.text
+        start = rng.randint(0, len(text))
+        end = min(len(text), start + rng.choice([0, 1, 5, 30, 200]))
+        insert = rng.choice(['', ' ', '\n\n', random_words(rng, rng.randint(1, 30)), '\n\n' + random_words(rng, 20) + '\n\n'])
+        chapter.text = text[:start] + insert + text[end:]
+        db.session.commit()
+        text = db.session.get(Chapter, chapter_id).text
+        chunks = db.session.scalars(db.select(ChapterChunk.text).where(ChapterChunk.chapter_id == chapter_id).order_by(ChapterChunk.position)).all()
+        if ''.join(chunks) != text:
+            failures.append(f"chunks of edit {n} don't rejoin to Chapter.text")
+            return
+        _, index = story_mention_index(db.session.connection(), story_id)
+        stored = {row.character_id: row.count for row in CharacterMention.query.filter_by(chapter_id=chapter_id) if row.count}
+        if stored != index.counts(text):
+            failures.append(f"mention counts after edit {n} are {stored}, a recount gives {index.counts(text)}")
+            return
+
+
+def check_revisions(client, story_id, chapter_id, rng, edits, failures):
+    url = f'/story/{story_id}/chapter/{chapter_id}/autosave'
+    saved = client.get(url).get_json()
+    texts = {saved['revision']: saved['text']}
+    kept = []  # revisions that held the text just before a checkpoint save
+    for n in range(edits):
+        text = saved['text']
+        checkpoint = rng.random() < 0.1
+        if checkpoint:
+            new_text = text + '\n\n' + random_words(rng, rng.randint(5, 60))
+            kept.append(saved['revision'])
+        else:
+            new_text = random_edit(rng, text)
+        response = client.post(url, json={
+            'base_revision': saved['revision'], 'base_length': len(text), 'checkpoint': checkpoint,
+            'ops': [python_splice(text, new_text)],
+        })
+        if response.status_code != 200:
+            failures.append(f"revision edit {n} returned {response.status_code}: {response.get_json()}")
+            return
+        saved = {'revision': response.get_json()['revision'], 'text': new_text}
+        texts[saved['revision']] = new_text
+    with app.app_context():
+        connection = db.session.connection()
+        stored = db.session.scalars(db.select(ChapterRevision.revision).where(ChapterRevision.chapter_id == chapter_id)).all()
+        for revision in stored:
+            if rebuild_revision_text(connection, chapter_id, revision) != texts[revision]:
+                failures.append(f"revision {revision} doesn't rebuild to the text saved at it")
+                return
+        lost = sorted(set(kept) - set(stored))
+        if lost:
+            failures.append(f"the text before a checkpoint save is gone from history at revisions {lost}")
+            return
+    target = rng.choice(stored)
+    client.post(f'/story/{story_id}/chapter/{chapter_id}/revisions/{target}/restore')
+    if client.get(url).get_json()['text'] != texts[target]:
+        failures.append(f"restoring revision {target} didn't bring back its text")
+
+
+def check_text_ops(rng, rounds, failures):
+    for n in range(rounds):
+        text = random_text(rng, rng.randint(0, 40))
+        cuts = sorted(rng.randint(0, len(text)) for _ in range(2 * rng.randint(0, 4)))
+        ops = [{'start': start, 'end': end, 'text': random_text(rng, rng.randint(0, 3))} for start, end in zip(cuts[::2], cuts[1::2])]
+        expected = text
+        for op in reversed(ops):
+            expected = expected[:op['start']] + op['text'] + expected[op['end']:]
+        if apply_text_ops(text, ops) != expected:
+            failures.append(f"apply_text_ops({text!r}, {ops!r}) != {expected!r}")
+            return
+        start, end, insert = text_splice(text, expected)
+        if python_splice(text, expected) != {'start': start, 'end': end, 'text': insert}:
+            failures.append(f"text_splice({text!r}, {expected!r}) gave {(start, end, insert)!r}, not the smallest splice")
+            return
+        wide = [op for op in ops if op['end'] > op['start']]
+        for bad in ([{'start': 0, 'end': len(text) + 1}], [wide[0], {'start': wide[0]['end'] - 1, 'end': wide[0]['end']}] if wide else None):
+            if bad is None:
+                continue
+            try:
+                apply_text_ops(text, bad)
+            except ValueError:
+                continue
+            failures.append(f"apply_text_ops({text!r}, {bad!r}) accepted overlapping or out-of-range ops")
+            return
+
+
+def check_autosave(client, story_id, chapter_id, rng, edits, splice, failures):
+    url = f'/story/{story_id}/chapter/{chapter_id}/autosave'
+    for base in ('Hi 😀 there', ''):
+        saved = client.get(url).get_json()
+        op, base_length = splice(saved['text'], base)
+        response = client.post(url, json={'base_revision': saved['revision'], 'base_length': base_length, 'ops': [op]})
+        if response.status_code != 200:
+            failures.append(f"autosave to {base!r} returned {response.status_code}: {response.get_json()}")
+            return
+    text = 'Hi 😀 there'
+    for n in range(edits):
+        saved = client.get(url).get_json()
+        new_text = random_edit(rng, text)
+        op, base_length = splice(saved['text'], new_text)
+        response = client.post(url, json={'base_revision': saved['revision'], 'base_length': base_length, 'ops': [op]})
+        if response.status_code != 200:
+            failures.append(f"autosave edit {n} returned {response.status_code}: {response.get_json()}")
+            return
+        text = new_text
+        if client.get(url).get_json()['text'] != text:
+            failures.append(f"autosave edit {n} stored the wrong text")
+            return
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--edits', type=int, default=100)
+    parser.add_argument('--rounds', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with app.app_context():
+        db.create_all()
+        user = User(username='editor', password_hash='x')
+        story = Story(user=user, title='Edits')
+        chapter = Chapter(story=story, title='Chapter 1', text='', summary='')
+        db.session.add_all([user, story, chapter])
+        db.session.add_all([Character(story=story, name='Mary Jane'), Character(story=story, name='Mary'), Character(story=story, name='Jane', aliases='Bob')])
+        long_chapter = Chapter(story=story, title='Chapter 2', text='\n\n'.join(random_words(rng, 40) for _ in range(5)), summary='')
+        db.session.add(long_chapter)
+        db.session.commit()
+        history_chapter = Chapter(story=story, title='Chapter 3', text=random_words(rng, 50), summary='')
+        db.session.add(history_chapter)
+        db.session.commit()
+        user_id, story_id, chapter_id, history_chapter_id = user.id, story.id, chapter.id, history_chapter.id
+        failures = []
+        check_chunks(story_id, long_chapter.id, rng, args.edits * 3, failures)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+    check_text_ops(rng, args.rounds, failures)
+    check_autosave(client, story_id, chapter_id, rng, args.edits, editor_splice(), failures)
+    check_revisions(client, story_id, history_chapter_id, rng, args.edits * 3, failures)
+    if failures:
+        print('\n'.join(failures), file=sys.stderr)
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
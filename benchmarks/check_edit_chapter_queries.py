@@ -0,0 +1,89 @@
+# Fails (exit status 1) if the chapter editor needs more SQL queries than its
+# budget, or if the count grows with the number of characters, beats, key
+# events and world elements in the chapter.
+#
+#   python benchmarks/check_edit_chapter_queries.py
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('OPENROUTER_API_KEY', 'benchmark')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'query_budget.db')}"
+
+from sqlalchemy import event
+
+from main import app, db, User, Story, Chapter, Character, BeatScene, KeyEvent, WorldBuildingElement
+
+# user load + chapter/story join + characters + beats + key events + world elements
+GET_BUDGET = 6
+# the GET queries, the chapter UPDATE, recording the revision (four statements
+# on a first save), reading and rewriting the changed paragraph chunk, the
+# chapter and story word counts, the mention counts (a recount here, as the
+# cast changed after the chapter was written) and the working set reloaded
+# after the commit
+SAVE_BUDGET = 24
+
+
+def seed(items):
+    user = User(username=f'budget-{items}', password_hash='x')
+    story = Story(user=user, title='Budget')
+    chapter = Chapter(story=story, title='Chapter 1', text='Once upon a time.')
+    db.session.add_all([user, story, chapter])
+    for n in range(items):
+        db.session.add_all([
+            Character(story=story, name=f'Character {n}', traits='brave'),
+            BeatScene(chapter=chapter, description=f'Beat {n}', order=n),
+            KeyEvent(chapter=chapter, description=f'Event {n}', order=n),
+            WorldBuildingElement(chapter=chapter, category='History', description=f'Element {n}'),
+        ])
+    db.session.commit()
+    return user.id, story.id, chapter.id
+
+
+def count_queries(engine, client, method, url, data=None):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = client.open(url, method=method, data=data)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    if response.status_code != 200:
+        raise SystemExit(f"{method} {url} returned {response.status_code}")
+    return statements
+
+
+def main():
+    with app.app_context():
+        db.create_all()
+        fixtures = {items: seed(items) for items in (1, 50)}
+        engine = db.engine
+    failures = []
+    for label, method, data, budget in (
+        ('GET', 'GET', None, GET_BUDGET),
+        ('save', 'POST', {'title': 'Chapter 1', 'summary': '', 'text': 'Edited.'}, SAVE_BUDGET),
+    ):
+        counts = {}
+        for items, (user_id, story_id, chapter_id) in fixtures.items():
+            client = app.test_client()
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user_id)
+            statements = count_queries(engine, client, method, f'/story/{story_id}/chapter/{chapter_id}', data)
+            counts[items] = len(statements)
+            print(f"{label:<5} {items:>3} items per collection: {len(statements)} queries (budget {budget})")
+            if len(statements) > budget:
+                failures.append(f"{label} with {items} items ran {len(statements)} queries, budget is {budget}:\n  " + '\n  '.join(statements))
+        if len(set(counts.values())) > 1:
+            failures.append(f"{label} query count grows with the chapter's size: {counts}")
+    if failures:
+        print('\n'.join(failures), file=sys.stderr)
+        sys.exit(1)
+    print('OK')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+# Load test: many authors working at once against a running server. Each
+# author signs up, creates a story and then loops over what the editor does
+# all day: autosaving splices, reopening the chapter, character autocomplete
+# and library search. AI generation is left out so no model is billed; pass
+# --with-prompts to include prompt previews (retrieval and summaries, still no
+# completion call from the request itself).
+#
+#   python benchmarks/load_test.py --start [--authors 60] [--seconds 30]
+#   python benchmarks/load_test.py --url http://host:5000
+import argparse
+import os
+import random
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+WORDS = 'lighthouse harbor storm lantern smuggler tunnel cliff ledger signal tide map rope key stair keeper'.split()
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers, threads):
+    # gunicorn with the repo's config on a scratch database.
+    workdir = tempfile.mkdtemp()
+    port = free_port()
+    env = dict(
+        os.environ,
+        PORT=str(port),
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'load.db')}",
+        EMBEDDING_DIR=os.path.join(workdir, 'embeddings'),
+        TEMPLATE_CACHE_DIR=os.path.join(workdir, 'jinja_cache'),
+        SECRET_KEY='load-test',
+        GUNICORN_WORKERS=str(workers),
+        GUNICORN_THREADS=str(threads),
+        GUNICORN_ACCESS_LOG='',
+    )
+    env.setdefault('OPENROUTER_API_KEY', 'load-test')
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py', 'wsgi:app'], cwd=ROOT, env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            if requests.get(url + '/healthz', timeout=1).ok:
+                return server, url
+        except requests.ConnectionError:
+            time.sleep(0.2)
+    server.terminate()
+    raise SystemExit('server did not come up')
+
+
+class Author:
+    def __init__(self, url, number, run_id):
+        self.url = url
+        self.session = requests.Session()
+        self.rng = random.Random(number)
+        name = f'author{run_id}_{number}'
+        self.session.post(url + '/signup', data={'username': name, 'email': f'{name}@example.com', 'password': 'pw', 'password2': 'pw'})
+        response = self.session.post(url + '/story/new', data={'title': f'Story of {name}', 'description': 'load test'})
+        self.story_id = int(re.search(r'/story/(\d+)', response.url).group(1))
+        page = self.session.get(f'{url}/story/{self.story_id}/chapters').text
+        self.chapter_id = int(re.search(rf'/story/{self.story_id}/chapter/(\d+)', page).group(1))
+        self.session.post(f'{url}/story/{self.story_id}/characters', data={'add_character': '1', 'char_name': f'Maya {number}', 'char_traits': 'stubborn', 'char_backstory': 'keeper of the lighthouse'})
+        state = self.session.get(self.chapter_url('/autosave')).json()
+        self.revision, self.length = state['revision'], len(state['text'])
+
+    def chapter_url(self, suffix=''):
+        return f'{self.url}/story/{self.story_id}/chapter/{self.chapter_id}{suffix}'
+
+    def autosave(self):
+        sentence = ' '.join(self.rng.choices(WORDS, k=12)) + '. '
+        response = self.session.post(self.chapter_url('/autosave'), json={
+            'base_revision': self.revision, 'base_length': self.length,
+            'ops': [{'start': self.length, 'end': self.length, 'text': sentence}],
+        })
+        if response.ok:
+            self.revision, self.length = response.json()['revision'], self.length + len(sentence)
+        return response
+
+    def open_chapter(self):
+        return self.session.get(self.chapter_url())
+
+    def character_search(self):
+        return self.session.get(f'{self.url}/story/{self.story_id}/character_search', params={'q': 'may'})
+
+    def library_search(self):
+        return self.session.get(f'{self.url}/search', params={'q': self.rng.choice(WORDS), 'format': 'json'})
+
+    def prompt_preview(self):
+        return self.session.post(self.chapter_url('/prompt_preview'), data={'mode': 'beat', 'beat_scene_input': ' '.join(self.rng.choices(WORDS, k=10))})
+
+
+def main_():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--url')
+    parser.add_argument('--start', action='store_true', help='start gunicorn on a scratch database')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--threads', type=int, default=32)
+    parser.add_argument('--authors', type=int, default=60)
+    parser.add_argument('--seconds', type=float, default=30)
+    parser.add_argument('--think-ms', type=float, default=200, help='pause between an author\'s requests')
+    parser.add_argument('--with-prompts', action='store_true')
+    args = parser.parse_args()
+    if not args.url and not args.start:
+        parser.error('pass --url or --start')
+
+    server = None
+    url = args.url
+    if args.start:
+        server, url = start_server(args.workers, args.threads)
+    actions = [('autosave', 5), ('open_chapter', 2), ('character_search', 3), ('library_search', 2)]
+    if args.with_prompts:
+        actions.append(('prompt_preview', 1))
+    names, weights = zip(*actions)
+    authors = []
+    try:
+        run_id = int(time.time())
+        started = time.perf_counter()
+        for number in range(args.authors):
+            authors.append(Author(url, number, run_id))
+        print(f"{len(authors)} authors set up in {time.perf_counter() - started:.1f}s")
+        results = {name: [] for name in names}
+        failures = {name: {} for name in names}
+        lock = threading.Lock()
+        deadline = time.monotonic() + args.seconds
+
+        def work(author):
+            while time.monotonic() < deadline:
+                action = author.rng.choices(names, weights)[0]
+                began = time.perf_counter()
+                try:
+                    response = getattr(author, action)()
+                    reason = None if response.ok else f'HTTP {response.status_code}'
+                except requests.RequestException as e:
+                    reason = type(e).__name__
+                elapsed = (time.perf_counter() - began) * 1000
+                with lock:
+                    results[action].append(elapsed)
+                    if reason:
+                        failures[action][reason] = failures[action].get(reason, 0) + 1
+                time.sleep(author.rng.expovariate(1000 / args.think_ms) if args.think_ms else 0)
+
+        threads = [threading.Thread(target=work, args=(author,)) for author in authors]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        total = sum(len(values) for values in results.values())
+        print(f"{total / args.seconds:.1f} requests/s over {args.seconds:.0f}s with {args.authors} authors")
+        for name in names:
+            values = sorted(results[name])
+            if values:
+                print(f"  {name:<17} {len(values) / args.seconds:7.1f}/s  p50 {statistics.median(values):7.1f} ms  "
+                      f"p95 {values[int(0.95 * (len(values) - 1))]:7.1f} ms  p99 {values[int(0.99 * (len(values) - 1))]:7.1f} ms  "
+                      f"failed {sum(failures[name].values())} {failures[name] or ''}")
+    finally:
+        # Open keep-alive connections would hold up the server's graceful shutdown.
+        for author in authors:
+            author.session.close()
+        if server:
+            server.terminate()
+            server.wait(timeout=60)
+
+
+if __name__ == '__main__':
+    main_()
@@ -0,0 +1,44 @@
+# gunicorn -c gunicorn.conf.py wsgi:app
+#
+# Generation requests spend seconds to minutes waiting on OpenRouter, so each
+# worker process serves many requests on threads (gthread) rather than one at
+# a time. GUNICORN_WORKER_CLASS=gevent switches to greenlets for very large
+# numbers of open SSE streams; it needs the gevent package installed.
+import multiprocessing
+import os
+import subprocess
+import sys
+
+bind = os.environ.get('GUNICORN_BIND', f"0.0.0.0:{os.environ.get('PORT', 5000)}")
+workers = int(os.environ.get('GUNICORN_WORKERS', min(multiprocessing.cpu_count() * 2 + 1, 8)))
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+threads = int(os.environ.get('GUNICORN_THREADS', 32))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 1000))  # gevent only
+# gthread workers heartbeat from their main thread, so a long generation does
+# not count against timeout; it only catches a wedged worker.
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+# On SIGTERM each worker stops accepting, finishes in-flight requests (SSE
+# streams included) and then drains background generation jobs, all within
+# graceful_timeout. It defaults to JOB_TIMEOUT plus headroom.
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', float(os.environ.get('JOB_TIMEOUT', 180)) + 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 0))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 0))
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG', '-') or None  # Empty disables
+preload_app = False
+
+
+def on_starting(server):
+    # Schema upgrades and backfills run once, before any worker exists. Jobs
+    # left running are requeued by the workers once their heartbeat is stale.
+    # The upgrades run in a child process so the master never imports
+    # the app: with preload_app off, each worker loads its own copy and the
+    # master holds no database connections to leak into forks.
+    subprocess.run([sys.executable, '-c', 'import main; main.prepare_database()'], cwd=os.path.dirname(os.path.abspath(__file__)), check=True)
+
+
+def worker_exit(server, worker):
+    import main
+    remaining = main.drain_background_work(timeout=max(graceful_timeout - 10, 1))
+    if remaining:
+        server.log.warning("Worker %s exiting with %s generation jobs still running; other workers requeue them once their heartbeat goes stale", worker.pid, remaining)
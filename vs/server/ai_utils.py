@@ -1,23 +1,93 @@
 # AI summarization logic using OpenAI API
 import os
+import time
+import threading
+from collections import deque
 from openai import OpenAI
 from dotenv import load_dotenv
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+AI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", 30))
+AI_MAX_RETRIES = int(os.getenv("OPENAI_MAX_RETRIES", 3))
+
+# Created once and reused so every summary shares one keep-alive connection pool.
+# The SDK retries 429/5xx responses with jittered exponential backoff.
+_client = None
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = OpenAI(api_key=OPENAI_API_KEY, timeout=AI_TIMEOUT, max_retries=AI_MAX_RETRIES)
+    return _client
+
+# Timing and token usage of recent AI calls, plus a latency histogram per model
+# and route for the /metrics endpoint.
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+recent_calls = deque(maxlen=500)
+_latency = {}
+_outcomes = {}
+_tokens = {}
+_metrics_lock = threading.Lock()
+
+def record_call(model, route, latency, prompt_tokens=None, completion_tokens=None, error=None):
+    with _metrics_lock:
+        recent_calls.append({
+            'model': model,
+            'route': route,
+            'latency_seconds': round(latency, 4),
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'error': error,
+        })
+        counts, total, count = _latency.get((model, route), ([0] * len(LATENCY_BUCKETS), 0.0, 0))
+        counts = [c + (1 if latency <= bound else 0) for c, bound in zip(counts, LATENCY_BUCKETS)]
+        _latency[(model, route)] = (counts, total + latency, count + 1)
+        outcome = (model, route, 'error' if error else 'ok')
+        _outcomes[outcome] = _outcomes.get(outcome, 0) + 1
+        for kind, value in (('prompt', prompt_tokens), ('completion', completion_tokens)):
+            if value:
+                _tokens[(model, kind)] = _tokens.get((model, kind), 0) + value
+
+def metrics_text():
+    lines = ['# HELP ai_request_duration_seconds Latency of AI calls.', '# TYPE ai_request_duration_seconds histogram']
+    with _metrics_lock:
+        for (model, route), (counts, total, count) in sorted(_latency.items()):
+            labels = f'model="{model}",route="{route}"'
+            for bound, bucket_count in zip(LATENCY_BUCKETS, counts):
+                lines.append(f'ai_request_duration_seconds_bucket{{{labels},le="{bound}"}} {bucket_count}')
+            lines.append(f'ai_request_duration_seconds_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'ai_request_duration_seconds_sum{{{labels}}} {total}')
+            lines.append(f'ai_request_duration_seconds_count{{{labels}}} {count}')
+        lines += ['# HELP ai_requests_total AI calls by outcome.', '# TYPE ai_requests_total counter']
+        for (model, route, outcome), count in sorted(_outcomes.items()):
+            lines.append(f'ai_requests_total{{model="{model}",route="{route}",outcome="{outcome}"}} {count}')
+        lines += ['# HELP ai_tokens_total Tokens reported by the provider.', '# TYPE ai_tokens_total counter']
+        for (model, kind), count in sorted(_tokens.items()):
+            lines.append(f'ai_tokens_total{{model="{model}",type="{kind}"}} {count}')
+    return '\n'.join(lines) + '\n'
 
 def summarize_customer_info(info):
     if not OPENAI_API_KEY:
         return "No API key found."
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    client = get_client()
+    model = "gpt-3.5-turbo-instruct"
     # Example prompt for summarization
     prompt = f"Summarize the following customer info: {info}"
+    started = time.monotonic()
     try:
         response = client.completions.create(
-            model="gpt-3.5-turbo-instruct",
+            model=model,
             prompt=prompt,
             max_tokens=100
         )
-        return response.choices[0].text.strip()
     except Exception as e:
+        record_call(model, 'summarize_customer_info', time.monotonic() - started, error=type(e).__name__)
         return f"AI summarization error: {e}"
+    usage = getattr(response, 'usage', None)
+    record_call(
+        model, 'summarize_customer_info', time.monotonic() - started,
+        prompt_tokens=usage.prompt_tokens if usage else None,
+        completion_tokens=usage.completion_tokens if usage else None,
+    )
+    return response.choices[0].text.strip()
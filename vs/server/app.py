@@ -1,4 +1,5 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify
+from ai_utils import metrics_text
 
 app = Flask(__name__)
 
@@ -15,5 +16,10 @@ def get_customer(customer_id):
     # TODO: Retrieve customer profile and dashboard
     return jsonify({'profile': {}, 'dashboard': {}})
 
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    # Prometheus text format for the AI summarization calls
+    return Response(metrics_text(), mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     app.run(debug=True)